@@ -1,6 +1,7 @@
 import random
-from board import BOARD_SIZE, EMPTY, HIT, MISS
-from graph import Vertex, GridGraph
+from board import SHIP_SIZES, EMPTY
+from graph import Vertex
+from backends import get_backend
 
 
 class AIState:
@@ -10,52 +11,38 @@ class AIState:
         self.target_hits = []
         self.target_dir = None   # 'H', 'V', or None
 
+    def reset(self):
+        self.mode = "HUNT"
+        self.tried.clear()
+        self.target_hits.clear()
+        self.target_dir = None
+
 
 class BattleshipAI:
-    def __init__(self):
+    def __init__(self, backend=None, parity=None):
+        # backend: "python", "numpy", "numba", "parallel", "auto" or None (→ $BATTLESHIP_BACKEND)
+        self.backend = get_backend(backend, parity)
         self.state = AIState()
-        self.remaining_ships = [5, 4, 3, 3, 2]
-        self.ship_size=5#for hunt mode
+        self.remaining_ships = list(SHIP_SIZES)
+        self.ship_size = max(SHIP_SIZES)  # for hunt mode
+
+    def reset(self):
+        # ready for a new game; the backend (and any worker pool) is kept
+        self.state.reset()
+        self.remaining_ships[:] = SHIP_SIZES
+        self.ship_size = max(SHIP_SIZES)
 
     # -------------------------------------------------
     # GRAPH TRAVERSAL (DFS on HIT components)
     # -------------------------------------------------
     def _hit_components(self, ai_view):
-        graph = GridGraph(ai_view)
-        visited = set()
-        components = []
-
-        for r in range(ai_view.size):
-            for c in range(ai_view.size):
-                if ai_view.grid[r][c] != HIT:
-                    continue
-
-                start = Vertex(r, c)
-                if start in visited:
-                    continue
-
-                stack = [start]
-                visited.add(start)
-                comp = []
-
-                # ---- DFS ----
-                while stack:
-                    v = stack.pop()
-                    comp.append(v)
-
-                    for n in graph.neighbors(v):
-                        if n not in visited and ai_view.grid[n.r][n.c] == HIT:
-                            visited.add(n)
-                            stack.append(n)
-
-                components.append(comp)
-
-        return components
+        return self.backend.hit_components(ai_view)
 
     # -------------------------------------------------
     # TARGET MODE (GREEDY EXPANSION)
     # -------------------------------------------------
     def _target_shot(self, ai_view):
+        n = ai_view.size
         components = self._hit_components(ai_view)
 
         # If we already have target hits, lock to that component
@@ -84,7 +71,7 @@ class BattleshipAI:
 
             for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
                 nr, nc = v.r + dr, v.c + dc
-                if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
+                if 0 <= nr < n and 0 <= nc < n:
                     if (nr, nc) not in self.state.tried and ai_view.grid[nr][nc] == EMPTY:
                         return nr, nc
 
@@ -112,7 +99,7 @@ class BattleshipAI:
             cols = merge_sort(list(cols))  # Replace sorted(cols)
 
             for c in (cols[0] - 1, cols[-1] + 1):
-                if 0 <= c < BOARD_SIZE:
+                if 0 <= c < n:
                     if (r, c) not in self.state.tried and ai_view.grid[r][c] == EMPTY:
                         return r, c
 
@@ -121,7 +108,7 @@ class BattleshipAI:
             rows = merge_sort(list(rows))  # Replace sorted(rows)
 
             for r in (rows[0] - 1, rows[-1] + 1):
-                if 0 <= r < BOARD_SIZE:
+                if 0 <= r < n:
                     if (r, c) not in self.state.tried and ai_view.grid[r][c] == EMPTY:
                         return r, c
 
@@ -133,13 +120,13 @@ class BattleshipAI:
         if self.state.target_dir == 'H':
             r = next(iter(rows))
             for c in (cols[0] - 1, cols[-1] + 1):
-                if 0 <= c < BOARD_SIZE and ai_view.grid[r][c] == EMPTY:
+                if 0 <= c < n and ai_view.grid[r][c] == EMPTY:
                     blocked = False
 
         elif self.state.target_dir == 'V':
             c = next(iter(cols))
             for r in (rows[0] - 1, rows[-1] + 1):
-                if 0 <= r < BOARD_SIZE and ai_view.grid[r][c] == EMPTY:
+                if 0 <= r < n and ai_view.grid[r][c] == EMPTY:
                     blocked = False
 
         if blocked:
@@ -156,89 +143,47 @@ class BattleshipAI:
     # HUNT MODE (GREEDY PROBABILITY SCAN)
     # -------------------------------------------------
     def _hunt_shot(self, ai_view):
-        while self.ship_size >= 2:
-            scores = self._score_with_ship(ai_view, self.ship_size)
-
-            # check if this ship size is still possible
-            max_score = 0
-            for _, _, s in scores:
-                if s > max_score:
-                    max_score = s
+        # backends that can pick the top cells themselves (parallel.py)
+        # return (top score, tied cells, longest run) and skip the scan here
+        best = self._score_best(ai_view, self.remaining_ships)
+        if best is None:
+            density, longest = self._score_runs(ai_view, self.remaining_ships)
+        else:
+            _, cells, longest = best
 
-            if max_score > 0:
-                return self._bucket_best_cell(scores)
+        # ships longer than every open run cannot fit anywhere → permanently discard.
+        # They added nothing to the density either, so no rescoring is needed.
+        self.remaining_ships = [l for l in self.remaining_ships if l <= longest]
+        self.ship_size = max(self.remaining_ships, default=0)
+        if self.ship_size < 2:
+            return None
 
-            # ship cannot fit anywhere → permanently discard
-            self.ship_size -= 1
+        if best is not None:
+            cells = [cell for cell in cells if cell not in self.state.tried]
+            return random.choice(cells) if cells else None
 
-        return None
+        scores = []
+        for r in range(ai_view.size):
+            for c in range(ai_view.size):
+                if (r, c) in self.state.tried or ai_view.grid[r][c] != EMPTY:
+                    continue
+                scores.append((r, c, density[r][c]))
 
+        if not scores:
+            return None
+        return self._bucket_best_cell(scores)
 
-    def _score_with_ship(self, ai_view, ship_len):
-        score_grid = [[0]*BOARD_SIZE for _ in range(BOARD_SIZE)]
-        scores = []
 
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                if (r, c) in self.state.tried:
-                    continue
+    # hot kernels live in backends.py so they can be swapped per host
+    def _score_runs(self, ai_view, ship_lens):
+        return self.backend.score_runs(ai_view, ship_lens)
 
-                if ai_view.grid[r][c] != EMPTY:
-                    continue
+    def _score_best(self, ai_view, ship_lens):
+        score_best = getattr(self.backend, "score_best", None)
+        return score_best(ai_view, ship_lens) if score_best else None
 
-                # ---- vertical ----
-                can_fit = True
-                for i in range(ship_len):
-                    if r+i >= BOARD_SIZE or ai_view.grid[r+i][c] == MISS:
-                        can_fit = False
-                        break
-                if can_fit:
-                    for i in range(ship_len):
-                        score_grid[r+i][c] += 1
-
-                # ---- horizontal ----
-                can_fit = True
-                for i in range(ship_len):
-                    if c+i >= BOARD_SIZE or ai_view.grid[r][c+i] == MISS:
-                        can_fit = False
-                        break
-                if can_fit:
-                    for i in range(ship_len):
-                        score_grid[r][c+i] += 1
-
-                scores.append((r, c, score_grid[r][c]))
-
-        return scores
-
-
-        
-    #bucket sorting algorithm
     def _bucket_best_cell(self, scores):
-        """
-        Custom bucket sort:
-        scores = [(r, c, score), ...]
-        Returns (r, c) with highest score
-        """
-
-        # Find max score
-        max_score = 0
-        for _, _, s in scores:
-            if s > max_score:
-                max_score = s
-
-        # Create buckets
-        buckets = [[] for _ in range(max_score + 1)]
-
-        # Fill buckets
-        for r, c, s in scores:
-            buckets[s].append((r, c))
-
-        # Greedy: highest score first
-        for score in range(max_score, -1, -1):
-            if buckets[score]:
-                return random.choice(buckets[score])
-
-        return None
+        return self.backend.bucket_best_cell(scores)
 
 
     # -------------------------------------------------
@@ -256,12 +201,13 @@ class BattleshipAI:
         if shot:
             return shot
 
-        # ultimate fallback (never None)
-        while True:
-            r = random.randint(0, BOARD_SIZE - 1)
-            c = random.randint(0, BOARD_SIZE - 1)
-            if (r, c) not in self.state.tried:
-                return r, c
+        # ultimate fallback: any cell not shot yet (None once all are)
+        n = ai_view.size
+        untried = [
+            (r, c) for r in range(n) for c in range(n)
+            if (r, c) not in self.state.tried
+        ]
+        return random.choice(untried) if untried else None
 
 
     def update_after_shot(self, r, c, result, ai_view):
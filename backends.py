@@ -0,0 +1,534 @@
+# backends.py
+# Interchangeable implementations of the AI's hot kernels.
+#
+#   python  - reference implementation, always available
+#   numpy   - vectorized kernels, used if numpy is installed
+#   numba   - JIT-compiled loops, used if numba is installed
+#   parallel - striped multi-process hunt scoring for very large boards
+#              (parallel.py), on top of the fastest of the above
+#
+# Pick one with BattleshipAI(backend=...) or the BATTLESHIP_BACKEND
+# environment variable. "auto" uses the fastest available backend on
+# boards of AUTO_MIN_SIZE and up, and the python kernels below that,
+# where array conversion costs more than it saves. A backend that cannot
+# be imported or compiled falls back to the next one down the list.
+# BATTLESHIP_BACKEND_PARITY=1 (or parity=True) cross-checks every kernel
+# call against the reference implementation.
+import heapq
+import os
+import random
+from board import EMPTY, HIT, MISS
+from graph import Vertex, GridGraph
+
+BACKEND_ENV = "BATTLESHIP_BACKEND"
+PARITY_ENV = "BATTLESHIP_BACKEND_PARITY"
+
+# fastest first; "auto" walks this list
+BACKEND_ORDER = ["numba", "numpy", "python"]
+
+# smallest board side where "auto" leaves the python kernels
+AUTO_MIN_SIZE = 16
+
+
+class PythonBackend:
+    """
+    Reference kernels in pure Python.
+    Every other backend must return the same results as this one.
+    """
+    name = "python"
+
+    # -------------------------------------------------
+    # GRAPH TRAVERSAL (DFS on HIT components)
+    # -------------------------------------------------
+    def hit_components(self, ai_view):
+        graph = GridGraph(ai_view)
+        visited = set()
+        components = []
+
+        for r in range(ai_view.size):
+            for c in range(ai_view.size):
+                if ai_view.grid[r][c] != HIT:
+                    continue
+
+                start = Vertex(r, c)
+                if start in visited:
+                    continue
+
+                stack = [start]
+                visited.add(start)
+                comp = []
+
+                # ---- DFS ----
+                while stack:
+                    v = stack.pop()
+                    comp.append(v)
+
+                    for n in graph.neighbors(v):
+                        if n not in visited and ai_view.grid[n.r][n.c] == HIT:
+                            visited.add(n)
+                            stack.append(n)
+
+                components.append(comp)
+
+        return components
+
+    # -------------------------------------------------
+    # HUNT SCORING
+    # -------------------------------------------------
+    def score_runs(self, ai_view, ship_lens):
+        """
+        Closed-form run-length scoring for every remaining ship at once.
+
+        Each row and column is split into maximal runs of non-MISS cells.
+        A cell at offset p inside a run of length R is covered by
+            min(p + 1, L, R - p, R - L + 1)
+        placements of a ship of length L (0 when L > R). run_cover sums
+        that over all ship lengths at once, with each run length's sums
+        computed once (RunValues), so the whole density map costs
+        O(N² + N·D) for D distinct ship lengths – O(N²) since D <= N.
+
+        Returns (density, longest) where longest is the longest open run.
+        """
+        n = ai_view.size
+        density = [[0] * n for _ in range(n)]
+        longest = 0
+        values = RunValues(ship_weights(ship_lens))
+
+        for r in range(n):
+            cover, run = run_cover(ai_view.grid[r], values)
+            longest = max(longest, run)
+            row = density[r]
+            for c in range(n):
+                row[c] += cover[c]
+
+        for c in range(n):
+            cover, run = run_cover([ai_view.grid[r][c] for r in range(n)], values)
+            longest = max(longest, run)
+            for r in range(n):
+                density[r][c] += cover[r]
+
+        return density, longest
+
+    #bucket sorting algorithm
+    def bucket_best_cell(self, scores):
+        """
+        Custom bucket sort:
+        scores = [(r, c, score), ...]
+        Returns (r, c) with highest score
+        """
+
+        # Find max score
+        max_score = 0
+        for _, _, s in scores:
+            if s > max_score:
+                max_score = s
+
+        # Create buckets
+        buckets = [[] for _ in range(max_score + 1)]
+
+        # Fill buckets
+        for r, c, s in scores:
+            buckets[s].append((r, c))
+
+        # Greedy: highest score first
+        for score in range(max_score, -1, -1):
+            if buckets[score]:
+                return random.choice(buckets[score])
+
+        return None
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Vectorized kernels. Boards are converted to boolean masks once per
+    call; all scans become cumulative sums over whole rows / columns.
+    """
+    name = "numpy"
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+
+    def _masks(self, ai_view):
+        cells = self.np.array(ai_view.grid)
+        return cells == EMPTY, cells == HIT, cells == MISS
+
+    def hit_components(self, ai_view):
+        np = self.np
+        _, hit, _ = self._masks(ai_view)
+        n = ai_view.size
+
+        # min-label propagation: every HIT cell starts with its own index
+        # and repeatedly takes the smallest label among its HIT neighbours
+        big = n * n
+        labels = np.where(hit, np.arange(big).reshape(n, n), big)
+        while True:
+            prev = labels
+            labels = labels.copy()
+            labels[1:, :] = np.minimum(labels[1:, :], np.where(hit[1:, :], prev[:-1, :], big))
+            labels[:-1, :] = np.minimum(labels[:-1, :], np.where(hit[:-1, :], prev[1:, :], big))
+            labels[:, 1:] = np.minimum(labels[:, 1:], np.where(hit[:, 1:], prev[:, :-1], big))
+            labels[:, :-1] = np.minimum(labels[:, :-1], np.where(hit[:, :-1], prev[:, 1:], big))
+            labels = np.where(hit, labels, big)
+            if np.array_equal(labels, prev):
+                break
+
+        # label = row-major index of the first cell, so ordering by label
+        # matches the reference discovery order
+        components = {}
+        rows, cols = np.nonzero(hit)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            components.setdefault(int(labels[r, c]), []).append(Vertex(r, c))
+        return [components[k] for k in sorted(components)]
+
+    def _open_runs(self, miss):
+        """
+        For every cell: its offset inside the open run along axis 1 and
+        the number of open cells after it. MISS cells get garbage.
+        """
+        np = self.np
+        n = miss.shape[1]
+        idx = np.broadcast_to(np.arange(n), miss.shape)
+        last_miss = np.maximum.accumulate(np.where(miss, idx, -1), axis=1)
+        offset = idx - last_miss - 1
+        rev = miss[:, ::-1]
+        next_miss = np.maximum.accumulate(np.where(rev, idx, -1), axis=1)[:, ::-1]
+        # reversed index of the nearest MISS to the right, back in original coordinates
+        after = np.where(next_miss < 0, n - 1 - idx, (n - 1 - next_miss) - idx - 1)
+        return offset, after
+
+    def _table(self, n, ship_lens):
+        # cover_table is rebuilt only when the board size or fleet changes
+        weights = ship_weights(ship_lens)
+        key = (n, tuple(sorted(weights.items())))
+        if getattr(self, "_table_key", None) != key:
+            self._table_key = key
+            self._table_cache = self.np.array(cover_table(n, weights), dtype=self.np.int64)
+        return self._table_cache
+
+    def score_runs(self, ai_view, ship_lens):
+        np = self.np
+        _, _, miss = self._masks(ai_view)
+        n = ai_view.size
+        table = self._table(n, ship_lens)
+        density = np.zeros((n, n), dtype=np.int64)
+        longest = 0
+
+        for axis_miss, transpose in ((miss, False), (miss.T, True)):
+            p, q = self._open_runs(axis_miss)
+            run = p + q + 1
+            open_cells = ~axis_miss
+            if open_cells.any():
+                longest = max(longest, int(run[open_cells].max()))
+            part = np.where(open_cells, table[np.where(open_cells, run, 0), np.minimum(p, q) + 1], 0)
+            density += part.T if transpose else part
+
+        return density.tolist(), longest
+
+    def bucket_best_cell(self, scores):
+        if not scores:
+            return None
+        np = self.np
+        values = np.fromiter((s for _, _, s in scores), dtype=np.int64, count=len(scores))
+        best = np.flatnonzero(values == values.max())
+        r, c, _ = scores[random.choice(best.tolist())]
+        return r, c
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    JIT-compiled versions of the scoring loops. Components and bucket
+    selection are already cheap in NumPy, so they are inherited.
+    """
+    name = "numba"
+
+    def __init__(self):
+        super().__init__()
+        self._runs_kernel = _numba_kernels()
+
+        # njit compiles lazily: force it now, on 1x1 inputs of the real
+        # types, so a JIT failure surfaces in get_backend (and falls back)
+        # instead of stalling or raising on the first shot
+        np = self.np
+        self._runs_kernel(np.zeros((1, 1), dtype=np.bool_), np.zeros((2, 2), dtype=np.int64))
+
+    def score_runs(self, ai_view, ship_lens):
+        _, _, miss = self._masks(ai_view)
+        table = self._table(ai_view.size, ship_lens)
+        density, longest = self._runs_kernel(miss, table)
+        return density.tolist(), int(longest)
+
+
+_NUMBA_KERNELS = None
+
+
+def _numba_kernels():
+    # compiled once per process, on first use
+    global _NUMBA_KERNELS
+    if _NUMBA_KERNELS is not None:
+        return _NUMBA_KERNELS
+
+    import numba
+    import numpy as np
+
+    @numba.njit
+    def add_line(density, miss, table, transpose):
+        n = miss.shape[0]
+        longest = 0
+        for a in range(n):
+            b = 0
+            while b < n:
+                m = miss[b, a] if transpose else miss[a, b]
+                if m:
+                    b += 1
+                    continue
+                start = b
+                while b < n and not (miss[b, a] if transpose else miss[a, b]):
+                    b += 1
+                run = b - start
+                if run > longest:
+                    longest = run
+                for p in range(run):
+                    v = table[run, min(p + 1, run - p)]
+                    if transpose:
+                        density[start + p, a] += v
+                    else:
+                        density[a, start + p] += v
+        return longest
+
+    @numba.njit
+    def runs_kernel(miss, table):
+        n = miss.shape[0]
+        density = np.zeros((n, n), dtype=np.int64)
+        longest = max(add_line(density, miss, table, False),
+                      add_line(density, miss, table, True))
+        return density, longest
+
+    _NUMBA_KERNELS = runs_kernel
+    return _NUMBA_KERNELS
+
+
+class SizedBackend:
+    """
+    What "auto" returns: reference kernels on small boards, the fast
+    backend once the board is at least min_size per side.
+    """
+
+    def __init__(self, fast, min_size=AUTO_MIN_SIZE):
+        self.small = PythonBackend()
+        self.fast = fast
+        self.min_size = min_size
+        self.name = f"auto({fast.name})"
+
+    def _pick(self, n):
+        return self.fast if n >= self.min_size else self.small
+
+    def hit_components(self, ai_view):
+        return self._pick(ai_view.size).hit_components(ai_view)
+
+    def score_runs(self, ai_view, ship_lens):
+        return self._pick(ai_view.size).score_runs(ai_view, ship_lens)
+
+    def bucket_best_cell(self, scores):
+        # one score per open cell, so compare against the board area
+        if len(scores) >= self.min_size * self.min_size:
+            return self.fast.bucket_best_cell(scores)
+        return self.small.bucket_best_cell(scores)
+
+
+class ParityBackend:
+    """
+    Runs every kernel on a fast backend and on the reference backend,
+    raising AssertionError on the first disagreement.
+    """
+
+    def __init__(self, fast):
+        self.fast = fast
+        self.reference = PythonBackend()
+        self.name = f"parity({fast.name})"
+
+    def _check(self, kernel, got, want):
+        if got != want:
+            raise AssertionError(
+                f"{self.fast.name} backend disagrees with python in {kernel}: {got!r} != {want!r}"
+            )
+
+    def hit_components(self, ai_view):
+        got = self.fast.hit_components(ai_view)
+        want = self.reference.hit_components(ai_view)
+        as_sets = lambda comps: [set((v.r, v.c) for v in comp) for comp in comps]
+        self._check("hit_components", as_sets(got), as_sets(want))
+        return got
+
+    def score_runs(self, ai_view, ship_lens):
+        got = self.fast.score_runs(ai_view, ship_lens)
+        self._check("score_runs", got, self.reference.score_runs(ai_view, ship_lens))
+        return got
+
+    def score_best(self, ai_view, ship_lens):
+        # only backends that pick top cells themselves (parallel) have this
+        score_best = getattr(self.fast, "score_best", None)
+        got = score_best(ai_view, ship_lens) if score_best else None
+        if got is not None:
+            density, longest = self.reference.score_runs(ai_view, ship_lens)
+            open_cells = [
+                (density[r][c], (r, c))
+                for r in range(ai_view.size) for c in range(ai_view.size)
+                if ai_view.grid[r][c] == EMPTY
+            ]
+            top = max((s for s, _ in open_cells), default=-1)
+            want = (top, sorted(cell for s, cell in open_cells if s == top), longest)
+            self._check("score_best", (got[0], sorted(got[1]), got[2]), want)
+        return got
+
+    def bucket_best_cell(self, scores):
+        # ties are broken at random, so only the chosen score is compared
+        got = self.fast.bucket_best_cell(scores)
+        best = max((s for _, _, s in scores), default=None)
+        chosen = next((s for r, c, s in scores if (r, c) == got), None)
+        self._check("bucket_best_cell", chosen, best)
+        return got
+
+
+BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+def ship_weights(ship_lens):
+    # weight per distinct length (two 3s count twice)
+    weights = {}
+    for length in ship_lens:
+        weights[length] = weights.get(length, 0) + 1
+    return weights
+
+
+def run_values(run, lengths):
+    """
+    Placement counts inside one open run of length `run`, by distance from
+    its nearer end: values[m] for a cell with m = min(p + 1, run - p).
+
+    For a ship of length L the count is min(m, c_L) with c_L = min(L, run - L + 1),
+    so with the c_L sorted the sum over all ships is
+        Σ_{c_L < m} w_L·c_L  +  m · Σ_{c_L >= m} w_L
+    and one pointer sweep gives every m in O(run + D).
+    lengths: sorted (length, weight) pairs, e.g. sorted(ship_weights(...).items())
+    """
+    half = (run + 1) // 2
+    # c_L rises with L up to the middle of the run, then falls: merge both halves
+    rising = [(length, w) for length, w in lengths if length <= half]
+    falling = [(run - length + 1, w) for length, w in reversed(lengths) if half < length <= run]
+    caps = list(heapq.merge(rising, falling))
+
+    values = [0] * (half + 1)
+    below = 0
+    above = sum(w for _, w in caps)
+    i = 0
+    for m in range(1, half + 1):
+        while i < len(caps) and caps[i][0] < m:
+            cap, w = caps[i]
+            below += w * cap
+            above -= w
+            i += 1
+        values[m] = below + m * above
+    return values
+
+
+class RunValues(dict):
+    """
+    run_values for one fleet, computed once per run length on first use.
+    A board has at most N distinct run lengths, so scoring a whole board
+    with one RunValues costs O(N² + N·D) rather than O(runs · D).
+    """
+
+    def __init__(self, weights):
+        super().__init__()
+        self.lengths = sorted(weights.items())
+
+    def __missing__(self, run):
+        values = self[run] = run_values(run, self.lengths)
+        return values
+
+
+def run_cover(line, values):
+    """
+    Placement counts along one row or column.
+    line: the cells of that row / column; values: RunValues(ship_weights(...)),
+    shared across all lines of one scoring pass
+    Returns (cover, longest) – cover[i] is the weighted number of
+    placements through cell i, longest the longest open run.
+    """
+    n = len(line)
+    cover = [0] * n
+    longest = 0
+    start = 0
+    for i in range(n + 1):
+        if i < n and line[i] != MISS:
+            continue
+        run = i - start
+        if run > longest:
+            longest = run
+        if run:
+            by_end = values[run]
+            for p in range(run):
+                cover[start + p] = by_end[min(p + 1, run - p)]
+        start = i + 1
+    return cover, longest
+
+
+def cover_table(n, weights):
+    """
+    values[m] from run_values for every run length up to n, as one
+    (n + 1) x (n // 2 + 2) table: table[run][m]. Lets vectorized
+    backends score a whole board with one gather, independent of
+    how many ship lengths remain.
+    """
+    values = RunValues(weights)
+    width = n // 2 + 2
+    table = [[0] * width]
+    for run in range(1, n + 1):
+        table.append(values[run] + [0] * (width - len(values[run])))
+    return table
+
+
+def get_backend(name=None, parity=None):
+    """
+    Returns a backend instance.
+    name:   "python", "numpy", "numba", "parallel" or "auto"; defaults to $BATTLESHIP_BACKEND, then "auto"
+    parity: wrap in ParityBackend; defaults to $BATTLESHIP_BACKEND_PARITY
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV, "auto")
+    name = name.lower()
+    if parity is None:
+        parity = os.environ.get(PARITY_ENV, "") not in ("", "0")
+
+    if name == "parallel":
+        from parallel import ParallelBackend
+        backend = ParallelBackend(get_backend("auto", parity=False))
+        return ParityBackend(backend) if parity else backend
+
+    if name == "auto":
+        candidates = BACKEND_ORDER
+    elif name in BACKENDS:
+        # requested backend, then everything slower than it
+        candidates = BACKEND_ORDER[BACKEND_ORDER.index(name):]
+    else:
+        raise ValueError(f"unknown backend {name!r}, expected one of {sorted(BACKENDS)}, 'parallel' or 'auto'")
+
+    for candidate in candidates:
+        try:
+            backend = BACKENDS[candidate]()
+            break
+        except Exception:
+            # missing package, or (numba) the JIT refused to compile
+            continue
+
+    if name == "auto" and backend.name != "python":
+        backend = SizedBackend(backend)
+
+    if parity and backend.name != "python":
+        return ParityBackend(backend)
+    return backend
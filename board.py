@@ -12,9 +12,71 @@ MISS = 'O'
 
 
 class Board:
-    def __init__(self):
-        self.size = BOARD_SIZE
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
         self.grid = [[EMPTY for _ in range(self.size)] for _ in range(self.size)]
+        # callables told about every change: watch(r, c, value) from
+        # set_cell, watch(None, None, None) after a reset or reindex
+        self.watchers = []
+        self.reindex()
+
+    def reset(self):
+        # back to an empty board, reusing the grid and index lists
+        n = self.size
+        for r in range(n):
+            row = self.grid[r]
+            row_free = self.row_free[r]
+            col_free = self.col_free[r]
+            for c in range(n):
+                row[c] = EMPTY
+                row_free[c] = n - c
+                col_free[c] = n - r
+        for watch in self.watchers:
+            watch(None, None, None)
+
+    # -------------------------------------------------
+    # FREE-RUN INDEX
+    # -------------------------------------------------
+    # row_free[r][c]: EMPTY cells from (r, c) going right, 0 if (r, c) is taken
+    # col_free[r][c]: EMPTY cells from (r, c) going down
+    # so "can a ship of length L start here" is a single lookup.
+    # Always change cells through set_cell (or call reindex after
+    # replacing grid wholesale) so the index stays in sync.
+    def reindex(self):
+        n = self.size
+        self.row_free = [[0] * n for _ in range(n)]
+        self.col_free = [[0] * n for _ in range(n)]
+        for r in range(n - 1, -1, -1):
+            for c in range(n - 1, -1, -1):
+                if self.grid[r][c] != EMPTY:
+                    continue
+                self.row_free[r][c] = 1 + (self.row_free[r][c + 1] if c + 1 < n else 0)
+                self.col_free[r][c] = 1 + (self.col_free[r + 1][c] if r + 1 < n else 0)
+        for watch in self.watchers:
+            watch(None, None, None)
+
+    def set_cell(self, r, c, value):
+        was_empty = self.grid[r][c] == EMPTY
+        self.grid[r][c] = value
+        for watch in self.watchers:
+            watch(r, c, value)
+        if was_empty == (value == EMPTY):
+            return
+
+        # only the run ending at (r, c) in its row and column can change:
+        # walk left / up until the previous taken cell
+        n = self.size
+        row = self.row_free[r]
+        for j in range(c, -1, -1):
+            if j < c and self.grid[r][j] != EMPTY:
+                break
+            row[j] = 0 if self.grid[r][j] != EMPTY else 1 + (row[j + 1] if j + 1 < n else 0)
+
+        for i in range(r, -1, -1):
+            if i < r and self.grid[i][c] != EMPTY:
+                break
+            below = self.col_free[i + 1][c] if i + 1 < n else 0
+            self.col_free[i][c] = 0 if self.grid[i][c] != EMPTY else 1 + below
 
     def in_bounds(self, r, c):
         return 0 <= r < self.size and 0 <= c < self.size
@@ -34,27 +96,20 @@ class Board:
         print()
 
     def can_place_ship(self, r, c, length, orientation):
+        if not self.in_bounds(r, c):
+            return False
         if orientation == 'H':
-            if c + length > self.size:
-                return False
-            for i in range(length):
-                if self.grid[r][c + i] != EMPTY:
-                    return False
-        else:
-            if r + length > self.size:
-                return False
-            for i in range(length):
-                if self.grid[r + i][c] != EMPTY:
-                    return False
-        return True
+            return self.row_free[r][c] >= length
+        return self.col_free[r][c] >= length
 
     def place_ship(self, r, c, length, orientation):
+        # start-to-end order: each set_cell stops at the cell placed before it
         if orientation == 'H':
             for i in range(length):
-                self.grid[r][c + i] = SHIP
+                self.set_cell(r, c + i, SHIP)
         else:
             for i in range(length):
-                self.grid[r + i][c] = SHIP
+                self.set_cell(r + i, c, SHIP)
 
     def random_place_ships(self, shipsizes):
         used_rows = set()
@@ -109,10 +164,10 @@ class Board:
             return "OUT"
         cell = self.grid[r][c]
         if cell == SHIP:
-            self.grid[r][c] = HIT
+            self.set_cell(r, c, HIT)
             return "HIT"
         elif cell == EMPTY:
-            self.grid[r][c] = MISS
+            self.set_cell(r, c, MISS)
             return "MISS"
         else:
             return "REPEAT"
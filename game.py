@@ -1,4 +1,5 @@
 # game.py
+import weakref
 from board import Board, SHIP, HIT, MISS, EMPTY, SHIP_SIZES
 from ai import BattleshipAI
 
@@ -18,6 +19,18 @@ class BattleshipGame:
         self.ai_board.random_place_ships(SHIP_SIZES)
         self.current_turn = "PLAYER"
 
+        # every shot that landed, in order: (shooter, r, c) – used for replays
+        self.shots = []
+
+    def reset(self):
+        # start a new game in place: same boards, same AI, fresh state
+        for board in (self.player_board, self.ai_board, self.player_view, self.ai_view):
+            board.reset()
+        self.ai.reset()
+        self.ai_board.random_place_ships(SHIP_SIZES)
+        self.current_turn = "PLAYER"
+        self.shots.clear()
+
     # called by UI during placement
     def player_can_place(self, r, c, length, orient):
         return self.player_board.can_place_ship(r, c, length, orient)
@@ -38,9 +51,11 @@ class BattleshipGame:
         result = self.ai_board.receive_shot(r, c)
         # mirror to what player sees
         if result == "HIT":
-            self.player_view.grid[r][c] = HIT
+            self.player_view.set_cell(r, c, HIT)
         elif result == "MISS":
-            self.player_view.grid[r][c] = MISS
+            self.player_view.set_cell(r, c, MISS)
+        if result in ("HIT", "MISS"):
+            self.shots.append(("PLAYER", r, c))
         return result
 
     def ai_shoot(self):
@@ -50,9 +65,11 @@ class BattleshipGame:
         self.ai.update_after_shot(r, c, result, self.ai_view)
 
         if result == "HIT":
-            self.ai_view.grid[r][c] = HIT
+            self.ai_view.set_cell(r, c, HIT)
         elif result == "MISS":
-            self.ai_view.grid[r][c] = MISS
+            self.ai_view.set_cell(r, c, MISS)
+        if result in ("HIT", "MISS"):
+            self.shots.append(("AI", r, c))
 
         return r, c, result
 
@@ -62,3 +79,58 @@ class BattleshipGame:
 
     def ai_won(self):
         return self.player_board.all_ships_sunk()
+
+
+class GamePool:
+    """
+    Bounded pool of reusable BattleshipGame objects.
+
+    acquire() hands out a reset game (recycled if one is free, otherwise
+    newly built); release() returns it, keeping at most max_size idle
+    games. Only games currently handed out by this pool can be released,
+    so a double release cannot give one game to two sessions.
+    stats() reports how many were built and how many reused.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.free = []
+        # games handed out and not yet returned (weak: a dropped game just disappears)
+        self.issued = weakref.WeakSet()
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self):
+        if self.free:
+            game = self.free.pop()
+            game.reset()
+            self.reused += 1
+        else:
+            game = BattleshipGame()
+            self.created += 1
+        self.issued.add(game)
+        return game
+
+    def release(self, game):
+        if game not in self.issued:
+            raise ValueError("game was not acquired from this pool or was already released")
+        self.issued.remove(game)
+        self.released += 1
+        if len(self.free) < self.max_size:
+            self.free.append(game)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        acquired = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "discarded": self.discarded,
+            "idle": len(self.free),
+            "in_use": len(self.issued),
+            "reuse_rate": self.reused / acquired if acquired else 0.0,
+        }
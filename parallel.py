@@ -0,0 +1,251 @@
+# parallel.py
+# Striped, multi-process hunt scoring for very large boards.
+#
+# The run-length density splits cleanly: horizontal placements only depend
+# on their row, vertical ones only on their column. Rows are scored in
+# row stripes and columns in column stripes by a pool of worker processes,
+# then a second pass adds both parts per row stripe and reports that
+# stripe's best score and the EMPTY cells tied at it. The parent only
+# merges those per-stripe results, so no O(N²) work stays serial.
+#
+# Board state and results live in shared memory:
+#
+#   board  : n*n bytes, the cell characters row by row
+#   horiz  : n*n int64, row contributions; after the merge pass the total density
+#   vert   : n*n int64, column contributions, stored column-major
+#
+# One StripePool (worker pool + segments) exists per board size and is
+# shared by every ParallelBackend in the process. The pool follows the
+# board it last scored through Board.watchers, so each move only the
+# changed cells are written to shared memory.
+#
+# Boards smaller than PARALLEL_MIN_SIZE are handed to the fallback backend,
+# where process overhead would outweigh the work.
+import os
+import weakref
+from array import array
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from backends import RunValues, run_cover, ship_weights
+
+PARALLEL_MIN_SIZE = 256
+
+# board size → StripePool, shared across all backends in this process
+_POOLS = {}
+
+
+def stripe_pool(n, workers=None):
+    pool = _POOLS.get(n)
+    if pool is None:
+        pool = _POOLS[n] = StripePool(n, workers or os.cpu_count() or 1)
+    return pool
+
+
+def close_pools():
+    # stop every worker pool and free the shared memory (also runs at exit)
+    for pool in list(_POOLS.values()):
+        pool.close()
+    _POOLS.clear()
+
+
+class StripePool:
+    def __init__(self, n, workers):
+        self.n = n
+        self.workers = workers
+
+        self.board_shm = SharedMemory(create=True, size=n * n)
+        self.horiz_shm = SharedMemory(create=True, size=n * n * 8)
+        self.vert_shm = SharedMemory(create=True, size=n * n * 8)
+        shms = (self.board_shm, self.horiz_shm, self.vert_shm)
+
+        # fork: workers inherit the mappings and never re-import the AI
+        self.pool = get_context("fork").Pool(
+            workers,
+            initializer=_worker_init,
+            initargs=(tuple(s.name for s in shms), n),
+        )
+        self.horiz = self.horiz_shm.buf.cast("q")
+        self._finalizer = weakref.finalize(self, _release, self.pool, shms, self.horiz)
+
+        # a few stripes per worker so uneven rows still balance
+        count = min(n, workers * 4)
+        step = -(-n // count)
+        self.stripes = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+
+        # which board is in shared memory, and what changed on it since
+        self.view = None
+        self.pending = []
+        self.stale = True
+
+    def close(self):
+        if self.view is not None:
+            self.view.watchers.remove(self._watch)
+            self.view = None
+        self.horiz = None
+        self._finalizer()
+
+    # -------------------------------------------------
+    # BOARD SYNC
+    # -------------------------------------------------
+    def _watch(self, r, c, value):
+        if r is None:
+            self.stale = True
+        elif not self.stale:
+            self.pending.append((r, c))
+
+    def sync(self, view):
+        buf = self.board_shm.buf
+        n = self.n
+
+        if view is not self.view:
+            if self.view is not None:
+                self.view.watchers.remove(self._watch)
+            self.view = view
+            view.watchers.append(self._watch)
+            self.stale = True
+
+        if self.stale:
+            for r in range(n):
+                buf[r * n:(r + 1) * n] = "".join(view.grid[r]).encode()
+            self.stale = False
+        else:
+            for r, c in self.pending:
+                buf[r * n + c] = ord(view.grid[r][c])
+        self.pending.clear()
+
+    # -------------------------------------------------
+    # SCORING
+    # -------------------------------------------------
+    def score(self, view, ship_lens):
+        """
+        Returns (top, cells, longest): the best density over EMPTY cells,
+        every EMPTY cell at that density, and the longest open run.
+        The full density is left in self.horiz.
+        """
+        self.sync(view)
+        weights = ship_weights(ship_lens)
+
+        # phase 1: row stripes and column stripes, independent
+        tasks = [("H", lo, hi, weights) for lo, hi in self.stripes]
+        tasks += [("V", lo, hi, weights) for lo, hi in self.stripes]
+        longest = max(self.pool.map(_score_stripe, tasks))
+
+        # phase 2: merge both directions per row stripe + stripe argmax
+        top, cells = -1, []
+        for stripe_top, stripe_cells in self.pool.map(_merge_stripe, self.stripes):
+            if stripe_top > top:
+                top, cells = stripe_top, list(stripe_cells)
+            elif stripe_top == top:
+                cells.extend(stripe_cells)
+        return top, cells, longest
+
+
+def _release(pool, shms, horiz):
+    pool.terminate()
+    pool.join()
+    if horiz is not None:
+        horiz.release()
+    for shm in shms:
+        shm.close()
+        shm.unlink()
+
+
+class ParallelBackend:
+    name = "parallel"
+
+    def __init__(self, fallback, workers=None, min_size=PARALLEL_MIN_SIZE):
+        self.fallback = fallback
+        self.workers = workers
+        self.min_size = min_size
+
+    # everything except hunt scoring is cheap enough on the fallback
+    def hit_components(self, ai_view):
+        return self.fallback.hit_components(ai_view)
+
+    def bucket_best_cell(self, scores):
+        return self.fallback.bucket_best_cell(scores)
+
+    # -------------------------------------------------
+    # HUNT SCORING
+    # -------------------------------------------------
+    def score_best(self, ai_view, ship_lens):
+        # None below the threshold: the AI then uses score_runs (→ fallback)
+        n = ai_view.size
+        if n < self.min_size:
+            return None
+        return stripe_pool(n, self.workers).score(ai_view, ship_lens)
+
+    def score_runs(self, ai_view, ship_lens):
+        n = ai_view.size
+        if n < self.min_size:
+            return self.fallback.score_runs(ai_view, ship_lens)
+
+        pool = stripe_pool(n, self.workers)
+        _, _, longest = pool.score(ai_view, ship_lens)
+        density = [pool.horiz[r * n:(r + 1) * n].tolist() for r in range(n)]
+        return density, longest
+
+
+# -------------------------------------------------
+# WORKER SIDE
+# -------------------------------------------------
+_shared = {}
+
+_EMPTY = ord(".")
+
+
+def _worker_init(names, n):
+    board, horiz, vert = (SharedMemory(name=name) for name in names)
+    _shared.update(
+        n=n,
+        shms=(board, horiz, vert),
+        board=board.buf,
+        horiz=horiz.buf.cast("q"),
+        vert=vert.buf.cast("q"),
+    )
+
+
+def _score_stripe(task):
+    axis, lo, hi, weights = task
+    n = _shared["n"]
+    board = _shared["board"]
+    out = _shared["horiz"] if axis == "H" else _shared["vert"]
+    values = RunValues(weights)
+    longest = 0
+
+    for i in range(lo, hi):
+        if axis == "H":
+            line = bytes(board[i * n:(i + 1) * n]).decode()
+        else:
+            line = bytes(board[i::n]).decode()
+        cover, run = run_cover(line, values)
+        longest = max(longest, run)
+        out[i * n:(i + 1) * n] = array("q", cover)
+
+    return longest
+
+
+def _merge_stripe(stripe):
+    lo, hi = stripe
+    n = _shared["n"]
+    board = _shared["board"]
+    horiz = _shared["horiz"]
+    vert = _shared["vert"]
+    top, cells = -1, []
+
+    for r in range(lo, hi):
+        row = horiz[r * n:(r + 1) * n].tolist()
+        col = vert[r::n].tolist()
+        total = [a + b for a, b in zip(row, col)]
+        horiz[r * n:(r + 1) * n] = array("q", total)
+
+        # argmax over cells the AI could still shoot
+        cells_row = board[r * n:(r + 1) * n]
+        for c, s in enumerate(total):
+            if s < top or cells_row[c] != _EMPTY:
+                continue
+            if s > top:
+                top, cells = s, []
+            cells.append((r, c))
+
+    return top, cells
@@ -0,0 +1,144 @@
+# replay.py
+# Recorded games and fast seeking for the replay viewer.
+#
+# A replay is the final state of both fleets plus the ordered shot list.
+# Ship cells are everything that ended up SHIP or HIT, so the starting
+# boards can be rebuilt without storing them separately.
+#
+# Every cell changes state at most once, so instead of board snapshots the
+# replay keeps, per board, the move at which each cell was shot. A cell
+# shows its final state at move k if it was shot before k, its starting
+# state otherwise. Seeking either applies / undoes just the shots between
+# the current move and the target, or – for long jumps – derives every
+# cell straight from that index. Memory stays O(N²) and no seek ever
+# replays from move one.
+import json
+from board import Board, EMPTY, SHIP, HIT, MISS
+
+NEVER = float("inf")
+
+
+class _Track:
+    """One board's start, end and per-cell shot move."""
+
+    def __init__(self, start_rows):
+        n = len(start_rows)
+        self.start = [str(row) for row in start_rows]
+        self.final = [list(row) for row in self.start]
+        self.shot_at = [[NEVER] * n for _ in range(n)]
+
+        # replay boards are drawn, never placed on, so the grid is written
+        # directly and Board's free-run index is not kept up to date
+        self.board = Board(n)
+        self.board.grid = [list(row) for row in self.start]
+
+    def record(self, move, r, c):
+        # repeated shots at a cell change nothing – keep the first one
+        if self.shot_at[r][c] == NEVER:
+            self.shot_at[r][c] = move
+            self.final[r][c] = HIT if self.start[r][c] == SHIP else MISS
+
+    def step(self, move, r, c, forward):
+        if self.shot_at[r][c] == move:
+            self.board.grid[r][c] = self.final[r][c] if forward else self.start[r][c]
+
+    def derive(self, move):
+        # state after `move` shots, written into the existing rows
+        for r, row in enumerate(self.board.grid):
+            start, final, shot_at = self.start[r], self.final[r], self.shot_at[r]
+            for c in range(len(row)):
+                row[c] = final[c] if shot_at[c] < move else start[c]
+
+
+class Replay:
+    def __init__(self, player_ships, ai_ships, shots):
+        """
+        player_ships / ai_ships: starting grids as lists of row strings
+        shots: [(shooter, r, c), ...] with shooter "PLAYER" or "AI"
+        """
+        self.size = len(player_ships)
+        self.shots = [(shooter, r, c) for shooter, r, c in shots]
+
+        self.player = _Track(player_ships)
+        self.ai = _Track(ai_ships)
+        for move, shot in enumerate(self.shots):
+            track, r, c = self._target(shot)
+            track.record(move, r, c)
+
+        self.player_board = self.player.board
+        self.ai_board = self.ai.board
+        self.move = 0
+        self.seek(len(self.shots))
+
+    def __len__(self):
+        return len(self.shots)
+
+    def _target(self, shot):
+        shooter, r, c = shot
+        return (self.ai if shooter == "PLAYER" else self.player), r, c
+
+    # -------------------------------------------------
+    # SEEKING
+    # -------------------------------------------------
+    def seek(self, move):
+        """
+        Puts both boards in the state after `move` shots.
+        Short moves touch only the shots in between; jumps longer than a
+        board's worth of cells rebuild both grids from the shot index.
+        """
+        move = max(0, min(move, len(self.shots)))
+
+        if abs(move - self.move) > self.size * self.size:
+            self.player.derive(move)
+            self.ai.derive(move)
+        elif move > self.move:
+            for i in range(self.move, move):
+                track, r, c = self._target(self.shots[i])
+                track.step(i, r, c, forward=True)
+        else:
+            for i in range(self.move - 1, move - 1, -1):
+                track, r, c = self._target(self.shots[i])
+                track.step(i, r, c, forward=False)
+
+        self.move = move
+        return self.player_board, self.ai_board
+
+    def last_shot(self):
+        # (shooter, r, c) of the move that produced the current state
+        if self.move == 0:
+            return None
+        return self.shots[self.move - 1]
+
+    # -------------------------------------------------
+    # SAVE / LOAD
+    # -------------------------------------------------
+    @classmethod
+    def from_game(cls, game):
+        return cls(
+            _starting_grid(game.player_board),
+            _starting_grid(game.ai_board),
+            game.shots,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["player_ships"], data["ai_ships"], data["shots"])
+
+    def save(self, path):
+        data = {
+            "player_ships": self.player.start,
+            "ai_ships": self.ai.start,
+            "shots": [list(shot) for shot in self.shots],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+
+def _starting_grid(board):
+    # undo every shot (works at any move): HIT was a ship, MISS was water
+    return tuple(
+        "".join(SHIP if cell in (SHIP, HIT) else EMPTY for cell in row)
+        for row in board.grid
+    )
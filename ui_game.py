@@ -3,6 +3,8 @@ import sys
 import pygame
 from board import BOARD_SIZE, SHIP_SIZES, SHIP, EMPTY, HIT, MISS
 from game import BattleshipGame
+from replay import Replay
+from backends import RunValues, run_cover, ship_weights
 
 pygame.init()
 
@@ -23,6 +25,14 @@ MISS_COLOR   = (120, 140, 170)  # Cool steel gray-blue
 HOVER_COLOR  = (255, 215, 0)    # Gold (very visible)
 VALID_COLOR  = (80, 220, 120)   # Bright mint green
 INVALID_COLOR= (255, 90, 90)    # Light danger red
+SCRUB_COLOR  = (80, 120, 200)   # Replay timeline
+
+HEAT_LEVELS = 16               # colour ramp steps
+HEAT_ALPHA   = 150
+
+REPLAY_FILE = "replay.json"
+REPLAY_STEP_MS = 250            # autoplay speed
+REPLAY_JUMP  = 32               # moves per PgUp / PgDn
 
 
 FONT = pygame.font.SysFont("consolas", 20)
@@ -59,26 +69,30 @@ def draw_hover(surface, top_left):
         pygame.draw.rect(surface, HOVER_COLOR, rect, 2)
 
 
-def draw_board(surface, board, top_left, reveal_ships=False, title=""):
+def draw_board(surface, board, top_left, reveal_ships=False, title="", cell_px=CELL):
     x0, y0 = top_left
+    n = board.size
 
     if title:
         label = BIG.render(title, True, TEXT)
         surface.blit(label, (x0, y0 - 40))
 
-    # column labels
-    for c in range(BOARD_SIZE):
-        col_txt = FONT.render(str(c), True, TEXT)
-        surface.blit(col_txt, (x0 + c * CELL + CELL // 2 - col_txt.get_width() // 2, y0 - 25))
+    # labels only while they still fit (and rows only up to 'Z')
+    if cell_px >= 20:
+        # column labels
+        for c in range(n):
+            col_txt = FONT.render(str(c), True, TEXT)
+            surface.blit(col_txt, (x0 + c * cell_px + cell_px // 2 - col_txt.get_width() // 2, y0 - 25))
 
-    # row labels
-    for r in range(BOARD_SIZE):
-        row_txt = FONT.render(chr(ord('A') + r), True, TEXT)
-        surface.blit(row_txt, (x0 - 25, y0 + r * CELL + CELL // 2 - row_txt.get_height() // 2))
+        # row labels
+        if n <= 26:
+            for r in range(n):
+                row_txt = FONT.render(chr(ord('A') + r), True, TEXT)
+                surface.blit(row_txt, (x0 - 25, y0 + r * cell_px + cell_px // 2 - row_txt.get_height() // 2))
 
-    for r in range(BOARD_SIZE):
-        for c in range(BOARD_SIZE):
-            rect = pygame.Rect(x0 + c * CELL, y0 + r * CELL, CELL, CELL)
+    for r in range(n):
+        for c in range(n):
+            rect = pygame.Rect(x0 + c * cell_px, y0 + r * cell_px, cell_px, cell_px)
 
             base_color = (25, 30, 45) if (r + c) % 2 == 0 else (30, 35, 55)
             cell = board.grid[r][c]
@@ -93,7 +107,82 @@ def draw_board(surface, board, top_left, reveal_ships=False, title=""):
                 color = base_color
 
             pygame.draw.rect(surface, color, rect)
-            pygame.draw.rect(surface, GRID, rect, 1)
+            if cell_px >= 4:
+                pygame.draw.rect(surface, GRID, rect, 1)
+
+
+# -------------------------------------------------
+# AI HUNT DENSITY OVERLAY
+# -------------------------------------------------
+def heat_color(t):
+    # 0 → cool blue, 0.5 → yellow, 1 → red
+    if t < 0.5:
+        k = t * 2
+        return (int(40 + 215 * k), int(90 + 125 * k), int(220 - 220 * k))
+    k = (t - 0.5) * 2
+    return (255, int(215 - 165 * k), 0)
+
+
+class Heatmap:
+    """
+    The AI's hunt density over the player's board.
+
+    Row and column contributions are kept separately, so a MISS at (r, c)
+    only recomputes row r and column c (a HIT does not split any run).
+    The overlay surface is redrawn only when the density changes, from
+    one cached tile per ramp level.
+    """
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.tiles = {}
+        self.surface = pygame.Surface((BOARD_SIZE * CELL, BOARD_SIZE * CELL), pygame.SRCALPHA)
+        self.view = None
+
+    def _tile(self, level):
+        tile = self.tiles.get(level)
+        if tile is None:
+            tile = pygame.Surface((CELL, CELL), pygame.SRCALPHA)
+            tile.fill(heat_color(level / (HEAT_LEVELS - 1)) + (HEAT_ALPHA,))
+            self.tiles[level] = tile
+        return tile
+
+    def _column(self, c):
+        return [self.view.grid[r][c] for r in range(self.view.size)]
+
+    def rebuild(self, ai_view):
+        self.view = ai_view
+        self.ships = list(self.ai.remaining_ships)
+        self.values = RunValues(ship_weights(self.ships))
+        n = ai_view.size
+        self.rows = [run_cover(ai_view.grid[r], self.values)[0] for r in range(n)]
+        self.cols = [run_cover(self._column(c), self.values)[0] for c in range(n)]
+        self._redraw()
+
+    def update(self, r, c, result):
+        # called after every ai_shoot
+        if self.ai.remaining_ships != self.ships:
+            self.rebuild(self.view)
+            return
+        if result == "MISS":
+            self.rows[r] = run_cover(self.view.grid[r], self.values)[0]
+            self.cols[c] = run_cover(self._column(c), self.values)[0]
+        self._redraw()
+
+    def _redraw(self):
+        n = self.view.size
+        density = [
+            [0 if self.view.grid[r][c] != EMPTY else self.rows[r][c] + self.cols[c][r] for c in range(n)]
+            for r in range(n)
+        ]
+        top = max(max(row) for row in density) or 1
+
+        self.surface.fill((0, 0, 0, 0))
+        for r in range(n):
+            for c in range(n):
+                if density[r][c]:
+                    level = density[r][c] * (HEAT_LEVELS - 1) // top
+                    self.surface.blit(self._tile(level), (c * CELL, r * CELL))
 
 
 def render_message(text):
@@ -128,6 +217,9 @@ def main():
 
     message = "Place your ships: select size, press R to rotate, click grid."
 
+    heatmap = Heatmap(game.ai)
+    show_heatmap = False
+
     running = True
     while running:
         clock.tick(60)
@@ -139,6 +231,11 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
                     orientation = 'V' if orientation == 'H' else 'H'
+                elif event.key == pygame.K_s and not placing_phase and (game.player_won() or game.ai_won()):
+                    Replay.from_game(game).save(REPLAY_FILE)
+                    message = f"Replay saved to {REPLAY_FILE}"
+                elif event.key == pygame.K_h and not placing_phase:
+                    show_heatmap = not show_heatmap
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = pygame.mouse.get_pos()
@@ -158,7 +255,8 @@ def main():
                                 current_length = ships_to_place[0]
                             else:
                                 placing_phase = False
-                                message = "Game start: fire on the RIGHT board."
+                                heatmap.rebuild(game.ai_view)
+                                message = "Game start: fire on the RIGHT board. (H: AI heatmap)"
                 else:
                     if not (game.player_won() or game.ai_won()):
                         cell = mouse_to_cell((mx, my), ai_anchor)
@@ -167,10 +265,11 @@ def main():
                             res = game.player_shoot(r, c)
                             if res in ("HIT", "MISS"):
                                 ar, ac, ares = game.ai_shoot()
+                                heatmap.update(ar, ac, ares)
                                 if game.player_won():
-                                    message = "YOU WIN! All enemy ships sunk."
+                                    message = "YOU WIN! All enemy ships sunk. (S to save replay)"
                                 elif game.ai_won():
-                                    message = "PC WINS! Your fleet is destroyed."
+                                    message = "PC WINS! Your fleet is destroyed. (S to save replay)"
                                 else:
                                     message = f"You: {res} at {chr(ord('A')+r)}{c}, PC: {ares} at {chr(ord('A')+ar)}{ac}"
                             elif res == "REPEAT":
@@ -193,6 +292,9 @@ def main():
             title="YOUR BOARD",
         )
 
+        if show_heatmap:
+            screen.blit(heatmap.surface, player_anchor)
+
         draw_board(
             screen,
             game.player_view if not placing_phase else game.ai_board,
@@ -252,5 +354,143 @@ def main():
     sys.exit()
 
 
+# -------------------------------------------------
+# REPLAY VIEWER
+# -------------------------------------------------
+def draw_last_shot(surface, replay, player_anchor, ai_anchor, cell_px):
+    # cell_px may be fractional when a huge board is scaled down
+    shot = replay.last_shot()
+    if shot:
+        shooter, r, c = shot
+        x0, y0 = ai_anchor if shooter == "PLAYER" else player_anchor
+        # never smaller than a few pixels, or it vanishes on huge boards
+        size = max(int(cell_px), 6)
+        rect = pygame.Rect(int(x0 + (c + 0.5) * cell_px) - size // 2,
+                           int(y0 + (r + 0.5) * cell_px) - size // 2, size, size)
+        pygame.draw.rect(surface, HOVER_COLOR, rect, 3 if cell_px >= 6 else 1)
+
+
+def draw_scrub_bar(surface, rect, move, total):
+    pygame.draw.rect(surface, (60, 60, 60), rect)
+    if total:
+        filled = rect.copy()
+        filled.width = rect.width * move // total
+        pygame.draw.rect(surface, SCRUB_COLOR, filled)
+    pygame.draw.rect(surface, GRID, rect, 1)
+
+
+def replay_main(path):
+    clock = pygame.time.Clock()
+    replay = Replay.load(path)
+    replay.seek(0)
+
+    # replays may come from any board size: fit both boards into the
+    # space the live game uses for two BOARD_SIZE boards. Boards with
+    # more cells than pixels are drawn at 1px per cell and scaled down.
+    area = BOARD_SIZE * CELL
+    n = replay.size
+    scaled = n > area
+    cell_px = 1 if scaled else min(CELL, area // n)
+    shown_px = area / n if scaled else cell_px
+
+    def draw_replay_board(board, anchor, title):
+        if not scaled:
+            draw_board(boards_layer, board, anchor, reveal_ships=True, title=title, cell_px=cell_px)
+            return
+        label = BIG.render(title, True, TEXT)
+        boards_layer.blit(label, (anchor[0], anchor[1] - 40))
+        full = pygame.Surface((n, n))
+        draw_board(full, board, (0, 0), reveal_ships=True, cell_px=1)
+        boards_layer.blit(pygame.transform.smoothscale(full, (area, area)), anchor)
+
+    player_anchor = (MARGIN_SIDE, MARGIN_TOP)
+    ai_anchor = (MARGIN_SIDE + area + GAP, MARGIN_TOP)
+
+    # both boards are redrawn only when the move changes (large boards
+    # are too many rects to draw every frame)
+    boards_layer = pygame.Surface((WIDTH, HEIGHT))
+    drawn_move = None
+    bar = pygame.Rect(MARGIN_SIDE, HEIGHT - 70, WIDTH - 2 * MARGIN_SIDE, 16)
+
+    playing = False
+    dragging = False
+    last_step = 0
+
+    def move_at(x):
+        frac = (x - bar.x) / bar.width
+        return round(max(0.0, min(1.0, frac)) * len(replay))
+
+    running = True
+    while running:
+        clock.tick(60)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    replay.seek(replay.move + 1)
+                elif event.key == pygame.K_LEFT:
+                    replay.seek(replay.move - 1)
+                elif event.key == pygame.K_PAGEUP:
+                    replay.seek(replay.move + REPLAY_JUMP)
+                elif event.key == pygame.K_PAGEDOWN:
+                    replay.seek(replay.move - REPLAY_JUMP)
+                elif event.key == pygame.K_HOME:
+                    replay.seek(0)
+                elif event.key == pygame.K_END:
+                    replay.seek(len(replay))
+
+            elif event.type == pygame.MOUSEBUTTONDOWN and bar.collidepoint(event.pos):
+                dragging = True
+                replay.seek(move_at(event.pos[0]))
+
+            elif event.type == pygame.MOUSEBUTTONUP:
+                dragging = False
+
+            elif event.type == pygame.MOUSEMOTION and dragging:
+                replay.seek(move_at(event.pos[0]))
+
+        now = pygame.time.get_ticks()
+        if playing and now - last_step >= REPLAY_STEP_MS:
+            last_step = now
+            if replay.move < len(replay):
+                replay.seek(replay.move + 1)
+            else:
+                playing = False
+
+        if replay.move != drawn_move:
+            drawn_move = replay.move
+            boards_layer.fill(BG)
+            banner = BIG.render("REPLAY", True, (180, 220, 180))
+            boards_layer.blit(banner, (WIDTH // 2 - banner.get_width() // 2, 20))
+            draw_replay_board(replay.player_board, player_anchor, "YOUR BOARD")
+            draw_replay_board(replay.ai_board, ai_anchor, "PC BOARD")
+            draw_last_shot(boards_layer, replay, player_anchor, ai_anchor, shown_px)
+
+        screen.blit(boards_layer, (0, 0))
+
+        draw_scrub_bar(screen, bar, replay.move, len(replay))
+
+        info = FONT.render(
+            f"Move {replay.move}/{len(replay)}   SPACE play/pause, arrows step, PgUp/PgDn jump, drag bar to seek",
+            True,
+            TEXT,
+        )
+        screen.blit(info, (MARGIN_SIDE, HEIGHT - 110))
+
+        pygame.display.flip()
+
+    pygame.quit()
+    sys.exit()
+
+
 if __name__ == "__main__":
-    main()
+    # python ui_game.py [replay.json]
+    if len(sys.argv) > 1:
+        replay_main(sys.argv[1])
+    else:
+        main()